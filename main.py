@@ -3,6 +3,13 @@ from uno_env import UNOGame
 from render import ASCIIUnoRenderer
 
 
+def random_set_bit(mask: int) -> int:
+    """从位掩码中等概率随机选取一个为 1 的位，返回其下标"""
+    for _ in range(random.randrange(bin(mask).count("1"))):
+        mask &= mask - 1  # 去掉最低位的 1
+    return (mask & -mask).bit_length() - 1
+
+
 if __name__ == "__main__":
     env = UNOGame(num_players=2, renderer=ASCIIUnoRenderer())
     obs = env.reset()
@@ -13,21 +20,21 @@ if __name__ == "__main__":
         env.render()
 
         while not done:
-            # 获取合法动作
-            current_player = env.players[env.current_player_idx]
-            valid_actions = [108]  # 摸牌动作
-            for action in range(108):
-                if env._is_valid_action(action, current_player):
-                    valid_actions.append(action)
+            # 获取合法动作（出牌部分，不含摸牌动作）
+            play_mask = env.legal_actions_mask() & ~(1 << 108)
 
             # 简单用户输入
             if env.current_player_idx == 0:  # 人类玩家
+                valid_actions = [108]  # 摸牌动作
+                bits = play_mask
+                while bits:
+                    lowest = bits & -bits
+                    valid_actions.append(lowest.bit_length() - 1)
+                    bits ^= lowest
                 choice = env.renderer.user_input(env, valid_actions)
                 action = valid_actions[choice]
-            else:  # AI随机选择
-                action = random.choice(
-                    valid_actions[1:] if len(valid_actions) > 1 else valid_actions
-                )  # 优先选择出牌
+            else:  # AI随机选择，优先选择出牌
+                action = random_set_bit(play_mask) if play_mask else 108
 
             obs, reward, done, info = env.step(action)
             env.render()
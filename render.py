@@ -1,20 +1,33 @@
-from uno_env import UNOGame, Card, CardColor, CardType, UNORenderer
+import re
+import shutil
+import sys
+from itertools import islice
+from typing import List, Optional
+from uno_env import UNOGame, Card, CardType, UNORenderer
 
 
 class ASCIIUnoRenderer(UNORenderer):
-    COLOR_CODES = {
-        CardColor.RED: "\033[41m",  # 红底
-        CardColor.YELLOW: "\033[43m",  # 黄底
-        CardColor.BLUE: "\033[44m",  # 蓝底
-        CardColor.GREEN: "\033[42m",  # 绿底
-        CardColor.BLACK: "\033[40m",  # 黑底
-    }
+    # 按颜色 id 索引（与 CardColor 的定义顺序一致）
+    COLOR_CODES = (
+        "\033[41m",  # 红底
+        "\033[43m",  # 黄底
+        "\033[44m",  # 蓝底
+        "\033[42m",  # 绿底
+        "\033[40m",  # 黑底
+    )
     RESET_CODE = "\033[0m"
+    ANSI_PATTERN = re.compile(r"\033\[[0-9;]*m")
     MAX_DISCARD_DISPLAY = 10
 
+    # 按 unique_id 索引的卡牌字符表示，首次渲染时生成
+    _card_strs: Optional[List[str]] = None
+    # 上一帧的各行及其在终端中占用的行数，用于差量渲染；None 表示需要整屏重绘
+    _prev_lines: Optional[List[str]] = None
+    _prev_heights: Optional[List[int]] = None
+
     def _card_repr(self, card: Card) -> str:
         """单个卡牌的字符表示"""
-        color_code = self.COLOR_CODES[card.color]
+        color_code = self.COLOR_CODES[card._color_id]
         text_color = "\033[37m"  # 白色文字
 
         # 处理特殊牌
@@ -32,64 +45,107 @@ class ASCIIUnoRenderer(UNORenderer):
 
         return f"{color_code}{text_color}{symbol:^4}{self.RESET_CODE}"
 
+    def _get_card_strs(self, env: UNOGame) -> List[str]:
+        """获取所有卡牌的字符表示（只生成一次）"""
+        if self._card_strs is None:
+            self._card_strs = [self._card_repr(card) for card in env.all_cards]
+        return self._card_strs
+
+    def invalidate(self):
+        """丢弃上一帧，下一次渲染时整屏重绘"""
+        self._prev_lines = None
+        self._prev_heights = None
+
+    def _line_heights(self, lines: List[str], width: int) -> List[int]:
+        """每行文本（去掉 ANSI 控制码后）在终端中占用的行数"""
+        return [
+            max(1, -(-len(self.ANSI_PATTERN.sub("", line)) // width)) for line in lines
+        ]
+
     def render(self, env: UNOGame, show_all=True):
         current_color = env.current_color
-        """渲染游戏界面"""
-        print("\033c")  # 清屏
+        """渲染游戏界面（只重绘与上一帧不同的行，整帧一次性写出）"""
+        card_strs = self._get_card_strs(env)
+        lines = [""]
 
         # 顶部信息
-        print(f"=== UNO Game (Players: {env.num_players}) ===")
-        print(f"Direction: {'→' if env.direction == 1 else '←'}")
-        print(
-            f"Current Color: {self.COLOR_CODES[current_color]}{current_color.value}{self.RESET_CODE}"
+        lines.append(f"=== UNO Game (Players: {env.num_players}) ===")
+        lines.append(f"Direction: {'→' if env.direction == 1 else '←'}")
+        lines.append(
+            f"Current Color: {self.COLOR_CODES[env._current_color_id]}{current_color.value}{self.RESET_CODE}"
         )
 
         # 弃牌堆显示
-        if env.discard_pile:
+        if env.discard_count:
             shown_cards = [
-                self._card_repr(card)
-                for card in env.discard_pile[-self.MAX_DISCARD_DISPLAY :][::-1]
+                card_strs[card_id]
+                for card_id in islice(env.discard_recent, self.MAX_DISCARD_DISPLAY)
             ]
-            print("\nDiscard Pile:", " ".join(shown_cards), end="")
-            if len(env.discard_pile) > self.MAX_DISCARD_DISPLAY:
-                print(
-                    f" (+{len(env.discard_pile) - self.MAX_DISCARD_DISPLAY} more)",
-                    end="",
-                )
-            print("")
-
+            line = "\nDiscard Pile: " + " ".join(shown_cards)
+            if env.discard_count > self.MAX_DISCARD_DISPLAY:
+                line += f" (+{env.discard_count - self.MAX_DISCARD_DISPLAY} more)"
+            lines.append(line)
         else:
-            print("\nDiscard Pile: [Empty]")
+            lines.append("\nDiscard Pile: [Empty]")
 
         # 玩家信息
-        print("\nPlayers:")
+        lines.append("\nPlayers:")
         for i, player in enumerate(env.players):
             status = ""
             if i == env.current_player_idx:
                 status = " ← CURRENT"
             if show_all or i == env.current_player_idx:
-                cards = " ".join([self._card_repr(c) for c in player.hand])
-                print(f"Player {i+1} ({len(player.hand)} cards){status}:")
+                cards = " ".join([card_strs[card_id] for card_id in player.hand])
+                lines.append(f"Player {i+1} ({len(player.hand)} cards){status}:")
                 if i == env.current_player_idx or show_all:
-                    print(f"  {cards}")
+                    lines.append(f"  {cards}")
                 else:
-                    print("  [Cards hidden]")
+                    lines.append("  [Cards hidden]")
             else:
-                print(f"Player {i+1}: {len(player.hand)} cards{status}")
+                lines.append(f"Player {i+1}: {len(player.hand)} cards{status}")
 
         # 牌堆信息
-        print(f"\nDeck remaining: {len(env.deck)} cards")
-        print("=" * 40)
+        lines.append(f"\nDeck remaining: {len(env.deck)} cards")
+        lines.append("=" * 40)
+
+        lines = "\n".join(lines).split("\n")
+        width, height = shutil.get_terminal_size()
+        heights = self._line_heights(lines, width)
+        if (
+            self._prev_lines is None
+            or heights != self._prev_heights
+            or sum(heights) >= height
+            or not sys.stdout.isatty()
+        ):
+            # 整屏重绘
+            output = "\033c" + "\n".join(lines) + "\n"
+        else:
+            # 差量渲染：定位到变化的行重写并清除行尾，最后清除帧下方的旧输出
+            parts = []
+            row = 1
+            for line, prev_line, line_height in zip(lines, self._prev_lines, heights):
+                if line != prev_line:
+                    parts.append(f"\033[{row};1H{line}\033[K")
+                row += line_height
+            parts.append(f"\033[{row};1H\033[J")
+            output = "".join(parts)
+        self._prev_lines = lines
+        self._prev_heights = heights
+
+        sys.stdout.write(output)
+        sys.stdout.flush()
 
     def user_input(self, env: UNOGame, valid_actions: list) -> int:
         """用户输入"""
-        print("Available actions:")
+        card_strs = self._get_card_strs(env)
+        parts = ["Available actions:\n"]
         for i, act in enumerate(valid_actions):
             if act < 108:
-                card = env.all_cards[act]
-                print(f"{i}: {self._card_repr(card)}", end=" ")
+                parts.append(f"{i}: {card_strs[act]} ")
             else:
-                print(f"{i}: Draw Card")
+                parts.append(f"{i}: Draw Card\n")
+        sys.stdout.write("".join(parts))
+        sys.stdout.flush()
         while True:
             try:
                 choice = int(input("\nSelect action: "))
@@ -99,4 +155,7 @@ class ASCIIUnoRenderer(UNORenderer):
             except ValueError:
                 print("Invalid choice. Try again.")
 
+        # 提示和输入可能使终端滚动，上一帧的行号定位不再可靠，下一帧整屏重绘
+        self.invalidate()
+
         return choice
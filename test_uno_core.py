@@ -0,0 +1,108 @@
+import numpy as np
+
+import uno_core
+from uno_core import DECK_TOP, PLAYER, DIRECTION, COLOR, TOP_CARD
+from uno_env import UNOGame
+
+
+def _core_state_from(env: UNOGame):
+    """把 UNOGame 的当前状态复制为 uno_core 使用的数组状态"""
+    state = np.array(
+        [
+            env.deck_top,
+            env.current_player_idx,
+            env.direction,
+            env._current_color_id,
+            env.discard_recent[0],
+        ],
+        dtype=np.int64,
+    )
+    hands = np.array([player._hand_vec for player in env.players], dtype=np.uint8)
+    skips = np.array([player.skip for player in env.players], dtype=np.uint8)
+    return state, hands, skips, env._deck_buf.copy(), env._discard_vec.copy()
+
+
+def _assert_same_state(env: UNOGame, state, hands, skips, deck, discard):
+    assert state[PLAYER] == env.current_player_idx
+    assert state[DIRECTION] == env.direction
+    assert state[COLOR] == env._current_color_id
+    assert state[TOP_CARD] == env.discard_recent[0]
+    assert state[DECK_TOP] == env.deck_top
+    np.testing.assert_array_equal(deck[: env.deck_top], env.deck)
+    np.testing.assert_array_equal(discard, env._discard_vec)
+    for i, player in enumerate(env.players):
+        np.testing.assert_array_equal(hands[i], player._hand_vec)
+        assert skips[i] == player.skip
+
+
+def test_step_core_matches_unogame_step():
+    """uno_core 与 UNOGame 两套规则实现逐步对比，防止二者不一致"""
+    rng = np.random.default_rng(0)
+    compared_steps = 0
+    for num_players in (2, 3, 4):
+        env = UNOGame(num_players=num_players)
+        for seed in range(30):
+            env.reset(seed=seed)
+            state, hands, skips, deck, discard = _core_state_from(env)
+            for _ in range(2000):
+                mask = env.legal_actions_mask()
+                actions = [i for i in range(109) if mask >> i & 1]
+                if rng.random() < 0.05:
+                    action = int(rng.integers(-1, 110))  # 也覆盖非法动作
+                else:
+                    action = int(rng.choice(actions[:-1] or actions))
+                discard_count = env.discard_count
+
+                _, reward, done, _ = env.step(action)
+                core_reward, core_done = uno_core._step_core(
+                    action,
+                    state,
+                    hands,
+                    skips,
+                    deck,
+                    discard,
+                    env.card_color,
+                    env.card_value_id,
+                    env.card_type,
+                )
+                assert (reward, done) == (core_reward, core_done)
+                if done or env.discard_count < discard_count:
+                    # 补充牌堆时两边的洗牌结果不同，之后无法逐步对比（补充牌堆单独测试）
+                    break
+                _assert_same_state(env, state, hands, skips, deck, discard)
+                compared_steps += 1
+    assert compared_steps > 1000
+
+
+def test_replenish_core_matches_unogame():
+    """补充牌堆：剩余的牌保持原顺序留在牌顶，其余弃牌（除牌顶外）放到下方"""
+    env = UNOGame(num_players=2)
+    env.reset(seed=0)
+    for _ in range(20):
+        mask = env.legal_actions_mask() & ~(1 << 108)
+        env.step((mask & -mask).bit_length() - 1 if mask else 108)
+    state, hands, skips, deck, discard = _core_state_from(env)
+    remaining = env.deck.copy()
+    discarded = set(np.flatnonzero(env._discard_vec)) - {env.discard_recent[0]}
+    assert len(discarded) > 3
+
+    env._replenish_deck()
+    uno_core._replenish_core(state, deck, discard)
+
+    for deck_top, new_deck, new_discard in (
+        (env.deck_top, env.deck, env._discard_vec),
+        (state[DECK_TOP], deck[: state[DECK_TOP]], discard),
+    ):
+        assert deck_top == len(remaining) + len(discarded)
+        np.testing.assert_array_equal(new_deck[len(discarded) :], remaining)
+        assert set(new_deck[: len(discarded)]) == discarded
+        assert list(np.flatnonzero(new_discard)) == [env.discard_recent[0]]
+
+
+def test_rollout_random_games():
+    env = UNOGame(num_players=3)
+    winners, lengths = env.rollout(200, seed=0)
+    assert winners.shape == lengths.shape == (200,)
+    assert ((winners >= -1) & (winners < 3)).all()
+    assert (lengths > 0).all()
+    np.testing.assert_array_equal(env.rollout(200, seed=0)[0], winners)
@@ -0,0 +1,63 @@
+import numpy as np
+
+from uno_env import UNOGame
+
+
+def _play_random_game(env: UNOGame, seed: int):
+    """用固定种子进行一局对局，返回每一步的 (动作, 奖励)"""
+    env.reset(seed=seed)
+    history = []
+    for _ in range(2000):
+        mask = env.legal_actions_mask()
+        actions = [i for i in range(109) if mask >> i & 1]
+        action = int(env.np_random.choice(actions))
+        _, reward, done, _ = env.step(action)
+        history.append((action, reward))
+        if done:
+            break
+    return history
+
+
+def test_reset_seed_is_reproducible():
+    first = UNOGame(num_players=3)
+    second = UNOGame(num_players=3)
+    assert _play_random_game(first, seed=42) == _play_random_game(second, seed=42)
+    assert [list(p.hand) for p in first.players] == [
+        list(p.hand) for p in second.players
+    ]
+
+
+def test_step_accepts_numpy_integer_action():
+    env = UNOGame(num_players=2)
+    # 找到一个开局时当前玩家有牌可出的种子
+    for seed in range(100):
+        env.reset(seed=seed)
+        mask = env.legal_actions_mask(as_array=True)
+        mask[108] = False
+        if mask.any():
+            break
+    player = env.players[env.current_player_idx]
+    action = np.argmax(mask)
+    assert isinstance(action, np.integer)
+    _, reward, _, info = env.step(action)
+    assert info["message"] != "Invalid action"
+    assert reward > 0
+    assert int(action) not in player.hand
+
+
+def test_terminal_observation_survives_reset():
+    env = UNOGame(num_players=2)
+    env.reset(seed=1)
+    for _ in range(2000):
+        mask = env.legal_actions_mask() & ~(1 << 108)
+        action = (mask & -mask).bit_length() - 1 if mask else 108
+        obs, _, done, _ = env.step(action)
+        if done:
+            break
+    assert done
+    hand = obs["hand"].copy()
+    discard_pile = obs["discard_pile"].copy()
+    assert discard_pile.any()
+    env.reset(seed=2)
+    np.testing.assert_array_equal(obs["hand"], hand)
+    np.testing.assert_array_equal(obs["discard_pile"], discard_pile)
@@ -0,0 +1,247 @@
+import numpy as np
+
+from uno_env import (
+    BLACK_ID,
+    SKIP_ID,
+    REVERSE_ID,
+    DRAW_TWO_ID,
+    WILD_ID,
+    WILD_DRAW_FOUR_ID,
+)
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:  # 没有安装 numba 时按普通 Python 函数执行
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# --------------------------
+# 纯数组实现的游戏核心逻辑（用于大批量自我对局）
+#
+# 规则与 UNOGame 一致，全部状态保存在 numpy 数组中：
+#   state:   int64[5]，标量状态，下标见下方常量
+#   hands:   uint8[num_players, 108]，各玩家手牌
+#   skips:   uint8[num_players]，被跳过标记
+#   deck:    int8[108]，deck[:state[DECK_TOP]] 为剩余牌堆，末尾为牌顶
+#   discard: uint8[108]，弃牌堆
+# --------------------------
+
+DECK_TOP, PLAYER, DIRECTION, COLOR, TOP_CARD = range(5)
+
+
+@njit(cache=True)
+def _replenish_core(state, deck, discard):
+    """补充牌堆：弃牌堆（除牌顶外）洗牌后放到剩余牌下方"""
+    top_id = state[TOP_CARD]
+    discard[top_id] = 0
+    discard_ids = np.flatnonzero(discard).astype(np.int8)
+    np.random.shuffle(discard_ids)
+    num_discard = discard_ids.shape[0]
+    deck_top = state[DECK_TOP]
+    deck[num_discard : num_discard + deck_top] = deck[:deck_top].copy()
+    deck[:num_discard] = discard_ids
+    state[DECK_TOP] = deck_top + num_discard
+    discard[:] = 0
+    discard[top_id] = 1
+
+
+@njit(cache=True)
+def _draw_core(state, hands, deck, discard, player, num_cards):
+    """从牌堆抽 num_cards 张牌加入玩家手牌"""
+    if state[DECK_TOP] < num_cards:
+        _replenish_core(state, deck, discard)
+    for _ in range(min(num_cards, state[DECK_TOP])):
+        state[DECK_TOP] -= 1
+        hands[player, deck[state[DECK_TOP]]] = 1
+
+
+@njit(cache=True)
+def _is_legal_core(action, state, hand, card_color, card_value):
+    """验证出牌是否合法"""
+    if action == 108:
+        return True
+    if action < 0 or action > 108 or hand[action] == 0:
+        return False
+    color = card_color[action]
+    return (
+        color == state[COLOR]
+        or card_value[action] == card_value[state[TOP_CARD]]
+        or color == BLACK_ID
+    )
+
+
+@njit(cache=True)
+def _choose_wild_color_core(hand, card_color):
+    """万能牌颜色选择：手牌中最多的颜色"""
+    counts = np.zeros(BLACK_ID, np.int64)
+    for card_id in range(108):
+        if hand[card_id] and card_color[card_id] != BLACK_ID:
+            counts[card_color[card_id]] += 1
+    return np.argmax(counts)
+
+
+@njit(cache=True)
+def _reset_core(state, hands, skips, deck, discard, card_color, card_type):
+    """重置游戏：洗牌、发牌并翻开第一张非万能牌"""
+    for i in range(108):
+        deck[i] = i
+    np.random.shuffle(deck)
+    hands[:] = 0
+    skips[:] = 0
+    discard[:] = 0
+    state[DECK_TOP] = 108
+    state[PLAYER] = 0
+    state[DIRECTION] = 1
+
+    for player in range(hands.shape[0]):
+        _draw_core(state, hands, deck, discard, player, 7)
+
+    top_idx = state[DECK_TOP] - 1
+    while card_type[deck[top_idx]] == WILD_ID or (
+        card_type[deck[top_idx]] == WILD_DRAW_FOUR_ID
+    ):
+        top_idx -= 1
+    top_id = deck[top_idx]
+    deck[top_idx] = deck[state[DECK_TOP] - 1]
+    state[DECK_TOP] -= 1
+    discard[top_id] = 1
+    state[TOP_CARD] = top_id
+    state[COLOR] = card_color[top_id]
+
+
+@njit(cache=True)
+def _step_core(
+    action, state, hands, skips, deck, discard, card_color, card_value, card_type
+):
+    """执行动作，返回 (reward, done)"""
+    num_players = hands.shape[0]
+    player = state[PLAYER]
+    if not _is_legal_core(action, state, hands[player], card_color, card_value):
+        return -1.0, False
+
+    if action < 108:
+        hands[player, action] = 0
+        discard[action] = 1
+        state[TOP_CARD] = action
+
+        # 处理颜色变化
+        if card_color[action] == BLACK_ID:
+            state[COLOR] = _choose_wild_color_core(hands[player], card_color)
+        else:
+            state[COLOR] = card_color[action]
+
+        type_id = card_type[action]
+        # 2人游戏时，反转牌等同于跳过牌
+        if type_id == REVERSE_ID and num_players == 2:
+            type_id = SKIP_ID
+
+        next_player = (player + state[DIRECTION]) % num_players
+        # 处理特殊牌效果
+        if type_id == SKIP_ID:
+            skips[next_player] = 1
+        elif type_id == REVERSE_ID:
+            state[DIRECTION] = -state[DIRECTION]
+        elif type_id == DRAW_TWO_ID:
+            _draw_core(state, hands, deck, discard, next_player, 2)
+            skips[next_player] = 1
+        elif type_id == WILD_DRAW_FOUR_ID:
+            _draw_core(state, hands, deck, discard, next_player, 4)
+            skips[next_player] = 1
+        reward = 1.0
+    else:
+        _draw_core(state, hands, deck, discard, player, 1)
+        reward = -0.1
+
+    # 检查胜利条件
+    if hands[player].sum() == 0:
+        return 100.0, True
+
+    # 转换玩家回合
+    while True:
+        player = (player + state[DIRECTION]) % num_players
+        if skips[player]:
+            skips[player] = 0
+        else:
+            break
+    state[PLAYER] = player
+    return reward, False
+
+
+@njit(cache=True)
+def _random_action_core(state, hand, card_color, card_value):
+    """随机选择一张可出的牌，没有可出的牌时摸牌"""
+    current_color = state[COLOR]
+    top_value = card_value[state[TOP_CARD]]
+    legal = np.empty(108, np.int64)
+    num_legal = 0
+    for action in range(108):
+        if hand[action] and (
+            card_color[action] == current_color
+            or card_value[action] == top_value
+            or card_color[action] == BLACK_ID
+        ):
+            legal[num_legal] = action
+            num_legal += 1
+    if num_legal == 0:
+        return 108
+    return legal[np.random.randint(num_legal)]
+
+
+@njit(cache=True)
+def _rollout_core(
+    num_games, num_players, max_steps, seed, card_color, card_value, card_type
+):
+    """随机策略自我对局，返回每局的胜者（超过 max_steps 未结束为 -1）和步数"""
+    # 编译后 np.random 是 numba 自己的生成器，不影响 NumPy 的全局随机状态
+    np.random.seed(seed)
+    state = np.zeros(5, np.int64)
+    hands = np.zeros((num_players, 108), np.uint8)
+    skips = np.zeros(num_players, np.uint8)
+    deck = np.zeros(108, np.int8)
+    discard = np.zeros(108, np.uint8)
+    winners = np.full(num_games, -1, np.int64)
+    lengths = np.full(num_games, max_steps, np.int64)
+
+    for game in range(num_games):
+        _reset_core(state, hands, skips, deck, discard, card_color, card_type)
+        for step in range(max_steps):
+            player = state[PLAYER]
+            action = _random_action_core(state, hands[player], card_color, card_value)
+            _, done = _step_core(
+                action,
+                state,
+                hands,
+                skips,
+                deck,
+                discard,
+                card_color,
+                card_value,
+                card_type,
+            )
+            if done:
+                winners[game] = player
+                lengths[game] = step + 1
+                break
+    return winners, lengths
+
+
+def rollout_random_games(
+    num_games, num_players, max_steps, seed, card_color, card_value, card_type
+):
+    """随机策略自我对局，返回每局的胜者（超过 max_steps 未结束为 -1）和步数"""
+    args = (num_games, num_players, max_steps, seed, card_color, card_value, card_type)
+    if HAS_NUMBA:
+        return _rollout_core(*args)
+    # 未编译时 np.random 即 NumPy 的全局随机状态，调用结束后恢复，避免影响调用者
+    global_state = np.random.get_state()
+    try:
+        return _rollout_core(*args)
+    finally:
+        np.random.set_state(global_state)
@@ -1,6 +1,7 @@
-import random
+import numpy as np
+from collections import deque
 from enum import Enum
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from gym import Env, spaces
 from abc import ABC, abstractmethod
 
@@ -26,7 +27,34 @@ class CardColor(Enum):
     BLACK = "black"
 
 
+# 内部热路径使用的整数 id，与枚举的定义顺序一致；枚举仅用于对外接口和渲染
+RED_ID, YELLOW_ID, BLUE_ID, GREEN_ID, BLACK_ID = range(5)
+NUMBER_ID, SKIP_ID, REVERSE_ID, DRAW_TWO_ID, WILD_ID, WILD_DRAW_FOUR_ID = range(6)
+COLORS = tuple(CardColor)
+COLOR_IDS = {color: i for i, color in enumerate(COLORS)}
+TYPE_IDS = {card_type: i for i, card_type in enumerate(CardType)}
+VALUES = tuple(str(num) for num in range(10)) + (
+    "skip",
+    "reverse",
+    "draw_two",
+    "wild",
+    "wild_draw_four",
+)
+VALUE_IDS = {value: i for i, value in enumerate(VALUES)}
+
+
 class Card:
+    # 所有卡牌都是 ALL_CARDS 中的单例，相等性直接使用默认的 is 比较
+    __slots__ = (
+        "color",
+        "value",
+        "type",
+        "unique_id",
+        "_color_id",
+        "_value_id",
+        "_type_id",
+    )
+
     def __init__(
         self, color: CardColor, value: str, card_type: CardType, unique_id: int
     ):
@@ -34,12 +62,68 @@ class Card:
         self.value = value
         self.type = card_type
         self.unique_id = unique_id
+        self._color_id = COLOR_IDS[color]
+        self._value_id = VALUE_IDS[value]
+        self._type_id = TYPE_IDS[card_type]
 
     def __repr__(self):
         return f"{self.color.value}_{self.value}"
 
-    def __eq__(self, other):
-        return self.unique_id == other.unique_id
+
+# --------------------------
+# 卡牌数据表（模块导入时创建一次，所有游戏实例共享，只读）
+# --------------------------
+
+
+def _create_all_cards() -> List[Card]:
+    """创建所有的卡牌"""
+    cards = []
+
+    def add_card(color, value, card_type):
+        cards.append(Card(color, value, card_type, len(cards)))
+
+    # 数字牌
+    for color in [c for c in CardColor if c != CardColor.BLACK]:
+        add_card(color, "0", CardType.NUMBER)
+        for num in range(1, 10):
+            add_card(color, str(num), CardType.NUMBER)
+            add_card(color, str(num), CardType.NUMBER)
+    # 功能牌
+    for color in [c for c in CardColor if c != CardColor.BLACK]:
+        for _ in range(2):
+            add_card(color, "skip", CardType.SKIP)
+            add_card(color, "reverse", CardType.REVERSE)
+            add_card(color, "draw_two", CardType.DRAW_TWO)
+    # 万能牌
+    for _ in range(4):
+        add_card(CardColor.BLACK, "wild", CardType.WILD)
+        add_card(CardColor.BLACK, "wild_draw_four", CardType.WILD_DRAW_FOUR)
+    return cards
+
+
+def _readonly_int8(values) -> np.ndarray:
+    array = np.array(values, dtype=np.int8)
+    array.setflags(write=False)
+    return array
+
+
+ALL_CARDS = _create_all_cards()
+
+# 结构数组（SoA）形式的卡牌属性，下标为 unique_id
+CARD_COLOR_ID = _readonly_int8([card._color_id for card in ALL_CARDS])
+CARD_VALUE_ID = _readonly_int8([card._value_id for card in ALL_CARDS])
+CARD_TYPE_ID = _readonly_int8([card._type_id for card in ALL_CARDS])
+
+# 卡牌位掩码（按颜色 id / 点数 id 索引）：第 unique_id 位为 1 表示该牌属于对应集合
+COLOR_MASK = tuple(
+    sum(1 << card.unique_id for card in ALL_CARDS if card._color_id == color_id)
+    for color_id in range(len(COLORS))
+)
+VALUE_MASK = tuple(
+    sum(1 << card.unique_id for card in ALL_CARDS if card._value_id == value_id)
+    for value_id in range(len(VALUES))
+)
+BLACK_MASK = COLOR_MASK[BLACK_ID]
 
 
 # --------------------------
@@ -61,10 +145,20 @@ class NoMoreCardsError(Exception):
 
 
 class UNOGame(Env):
+    # 弃牌堆中保留最近出的牌的数量（供渲染显示）
+    RECENT_DISCARDS = 10
+
     def __init__(self, num_players: int = 2, renderer: "UNORenderer" = None):
         super().__init__()
 
-        self.all_cards = self._create_all_card()
+        # 卡牌数据表在模块级共享，这里只保存引用
+        self.all_cards = ALL_CARDS
+        self.color_mask = COLOR_MASK
+        self.value_mask = VALUE_MASK
+        self.black_mask = BLACK_MASK
+        self.card_color = CARD_COLOR_ID
+        self.card_value_id = CARD_VALUE_ID
+        self.card_type = CARD_TYPE_ID
 
         # 动作空间：0-107代表108种牌，108代表摸牌
         self.action_space = spaces.Discrete(109)
@@ -83,64 +177,67 @@ class UNOGame(Env):
 
         self.num_players = num_players
         self.players: List[Player] = []
-        self.deck: List[Card] = []
-        self.discard_pile: List[Card] = []
+        # 牌堆：_deck_buf[:deck_top] 为剩余牌的 unique_id，末尾为牌顶
+        self._all_ids = np.arange(108, dtype=np.int8)
+        self._deck_buf = self._all_ids.copy()
+        self.deck_top = 0
+        # 最近的弃牌（unique_id，下标 0 为牌顶）与弃牌总数
+        self.discard_recent: deque = deque(maxlen=self.RECENT_DISCARDS)
+        self.discard_count = 0
+        # 弃牌堆的 MultiBinary 观察向量，随出牌原地更新
+        self._discard_vec = np.zeros(108, dtype=np.uint8)
         self.current_player_idx = 0
         self.direction = 1
         self.current_color: Optional[CardColor] = None
+        self._current_color_id = BLACK_ID
+        # 当前牌顶和颜色下可以打出的牌的位掩码，牌顶或颜色变化时更新
+        self._playable_mask = 0
         self.renderer = renderer
 
-    def _create_all_card(self):
-        """创建所有的卡牌"""
-        cards = []
-
-        def add_card(color, value, card_type):
-            cards.append(Card(color, value, card_type, len(cards)))
-
-        # 数字牌
-        for color in [c for c in CardColor if c != CardColor.BLACK]:
-            add_card(color, "0", CardType.NUMBER)
-            for num in range(1, 10):
-                add_card(color, str(num), CardType.NUMBER)
-                add_card(color, str(num), CardType.NUMBER)
-        # 功能牌
-        for color in [c for c in CardColor if c != CardColor.BLACK]:
-            for _ in range(2):
-                add_card(color, "skip", CardType.SKIP)
-                add_card(color, "reverse", CardType.REVERSE)
-                add_card(color, "draw_two", CardType.DRAW_TWO)
-        # 万能牌
-        for _ in range(4):
-            add_card(CardColor.BLACK, "wild", CardType.WILD)
-            add_card(CardColor.BLACK, "wild_draw_four", CardType.WILD_DRAW_FOUR)
-        return cards
+    @property
+    def deck(self) -> np.ndarray:
+        """剩余牌堆（unique_id 数组，末尾为牌顶）"""
+        return self._deck_buf[: self.deck_top]
 
     def initialize_deck(self):
         """初始化牌堆"""
-        self.deck = [*self.all_cards]
-        random.shuffle(self.deck)
-
-    def reset(self):
-        """重置游戏"""
-        self.players = [Player() for _ in range(self.num_players)]
+        self._deck_buf[:] = self._all_ids
+        self.np_random.shuffle(self._deck_buf)
+        self.deck_top = len(self._deck_buf)
+
+    def reset(self, seed: Optional[int] = None):
+        """重置游戏（传入 seed 时重新设置随机数生成器，用法同 gym 的 reset(seed=...)）"""
+        super().reset(seed=seed)
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        # 玩家对象在首次重置时创建，之后每局只清空状态并复用
+        if not self.players:
+            self.players = [Player() for _ in range(self.num_players)]
+        for player in self.players:
+            player.clear()
         self.initialize_deck()
-        self.discard_pile = []
+        self.discard_recent.clear()
+        self.discard_count = 0
+        # 换用新的缓冲区而不是原地清零，上一局返回的观察（包括终局观察）不会被改写
+        self._discard_vec = np.zeros(108, dtype=np.uint8)
         self.current_player_idx = 0
         self.direction = 1
 
         # 发牌
         for player in self.players:
-            player.hand = [self.deck.pop() for _ in range(7)]
-
-        # 初始化弃牌堆
-        while True:
-            top_card = self.deck.pop()
-            if top_card.type not in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
-                self.discard_pile.append(top_card)
-                self.current_color = top_card.color
-                break
-            else:
-                self.deck.insert(0, top_card)
+            self._deal(player, 7)
+
+        # 初始化弃牌堆：从牌顶向下找到第一张非万能牌，换到牌顶后作为起始牌
+        deck = self.deck
+        top_idx = next(
+            i
+            for i in range(len(deck) - 1, -1, -1)
+            if self.card_type[deck[i]] not in (WILD_ID, WILD_DRAW_FOUR_ID)
+        )
+        deck[top_idx], deck[-1] = deck[-1], deck[top_idx]
+        top_card = self.all_cards[self._draw_cards(1)[0]]
+        self._discard(top_card)
+        self._set_current_color(top_card._color_id)
 
         return self._get_observation()
 
@@ -149,12 +246,14 @@ class UNOGame(Env):
             raise ValueError("Game has not been initialized. Call `reset()` first.")
 
         """执行动作"""
+        # 策略网络常返回 numpy 整数（如 argmax 的结果），位运算前转换为 Python int
+        action = int(action)
         player = self.players[self.current_player_idx]
         reward = 0
         done = False
         info = {"message": ""}
 
-        if not self._is_valid_action(action, player):
+        if not self._is_valid_action(action, player.hand_mask):
             reward = -1
             info["message"] = "Invalid action"
             return self._get_observation(), reward, done, info
@@ -164,7 +263,7 @@ class UNOGame(Env):
             self._play_card(card, player)
             reward = 1
         else:
-            player.hand.extend(self._draw_cards(1))
+            self._deal(player, 1)
             reward = -0.1
 
         # 检查胜利条件
@@ -188,96 +287,155 @@ class UNOGame(Env):
 
     def _replenish_deck(self):
         """补充牌堆：当牌堆用尽时，用弃牌堆重新洗牌"""
-        top_card = self.discard_pile[-1]
-        self.deck = self.discard_pile[:-1]
-        random.shuffle(self.deck)
-        self.discard_pile = [top_card]
-
-    def _is_valid_action(self, action: int, player: "Player") -> bool:
+        top_card = self.all_cards[self.discard_recent[0]]
+        self._discard_vec[top_card.unique_id] = 0
+        discard_ids = np.flatnonzero(self._discard_vec).astype(np.int8)
+        self.np_random.shuffle(discard_ids)
+        # 剩余的牌保留在牌顶，洗好的弃牌放在其下方
+        num_discard = len(discard_ids)
+        self._deck_buf[num_discard : num_discard + self.deck_top] = self.deck
+        self._deck_buf[:num_discard] = discard_ids
+        self.deck_top += num_discard
+        self.discard_recent.clear()
+        self.discard_count = 0
+        self._discard_vec.fill(0)
+        self._discard(top_card)
+
+    def _is_valid_action(self, action: int, hand_mask: int) -> bool:
         """验证出牌是否合法"""
-        top_card = self.discard_pile[-1]
         if not 0 <= action <= 108:
             return False
 
         if action == 108:
             return True
 
-        card = self.all_cards[action]
-
-        if card not in player.hand:
-            return False
-
-        if card.color == self.current_color:
-            return True
+        return bool((hand_mask & self._playable_mask) >> action & 1)
 
-        if card.value == top_card.value:
-            return True
+    def legal_actions_mask(self, as_array: bool = False):
+        """当前玩家的合法动作掩码：第 i 位为 1 表示动作 i 合法（摸牌动作 108 总是合法）
 
-        if card.color == CardColor.BLACK:
-            return True
+        as_array 为 True 时返回长度为 109 的 bool 数组，可直接作为策略网络的动作掩码
+        """
+        if len(self.players) == 0:
+            raise ValueError("Game has not been initialized. Call `reset()` first.")
+        mask = (
+            self.players[self.current_player_idx].hand_mask & self._playable_mask
+        ) | (1 << 108)
+        if not as_array:
+            return mask
+        return np.unpackbits(
+            np.frombuffer(mask.to_bytes(14, "little"), dtype=np.uint8),
+            count=109,
+            bitorder="little",
+        ).astype(bool)
 
     def _play_card(self, card: Card, player: "Player"):
         """处理出牌逻辑"""
-        player.hand.remove(card)
-        self.discard_pile.append(card)
+        player.remove_card(card)
+        self._discard(card)
 
         # 处理颜色变化
-        if card.color == CardColor.BLACK:
-            self.current_color = self._choose_wild_color()
+        if card._color_id == BLACK_ID:
+            self._set_current_color(self._choose_wild_color())
         else:
-            self.current_color = card.color
+            self._set_current_color(card._color_id)
 
-        card_type = card.type
+        card_type = card._type_id
         # 2人游戏时，反转牌等同于跳过牌
-        if card.type == CardType.REVERSE and len(self.players) == 2:
-            card_type = CardType.SKIP
+        if card_type == REVERSE_ID and len(self.players) == 2:
+            card_type = SKIP_ID
 
         next_player = self.players[
             (self.current_player_idx + self.direction) % self.num_players
         ]
         # 处理特殊牌效果
-        if card_type == CardType.SKIP:
+        if card_type == SKIP_ID:
             next_player.skip = True
-        elif card_type == CardType.REVERSE:
+        elif card_type == REVERSE_ID:
             self.direction *= -1
-        elif card_type == CardType.DRAW_TWO:
-            next_player.hand.extend(self._draw_cards(2))
+        elif card_type == DRAW_TWO_ID:
+            self._deal(next_player, 2)
             next_player.skip = True
-        elif card_type == CardType.WILD_DRAW_FOUR:
-            next_player.hand.extend(self._draw_cards(4))
+        elif card_type == WILD_DRAW_FOUR_ID:
+            self._deal(next_player, 4)
             next_player.skip = True
 
-    def _choose_wild_color(self) -> CardColor:
-        """万能牌颜色选择（简单实现：选择手牌中最多的颜色，实际应该让玩家选择）"""
-        color_counts = {color: 0 for color in CardColor if color != CardColor.BLACK}
-        for card in self.players[self.current_player_idx].hand:
-            if card.color != CardColor.BLACK:
-                color_counts[card.color] += 1
-        return max(color_counts, key=color_counts.get)
-
-    def _draw_cards(self, num_cards: int) -> List[Card]:
-        """抽牌"""
-        cards = []
-        if len(self.deck) < num_cards:
+    def _set_current_color(self, color_id: int):
+        """设置当前颜色，并按当前颜色和牌顶更新可出牌掩码（需在牌放到弃牌堆后调用）"""
+        self._current_color_id = color_id
+        self.current_color = COLORS[color_id]
+        top_card = self.all_cards[self.discard_recent[0]]
+        self._playable_mask = (
+            self.color_mask[color_id]
+            | self.value_mask[top_card._value_id]
+            | self.black_mask
+        )
+
+    def _discard(self, card: Card):
+        """将牌放到弃牌堆顶"""
+        self.discard_recent.appendleft(card.unique_id)
+        self.discard_count += 1
+        self._discard_vec[card.unique_id] = 1
+
+    def _choose_wild_color(self) -> int:
+        """万能牌颜色选择，返回颜色 id（简单实现：选择手牌中最多的颜色，实际应该让玩家选择）"""
+        color_counts = np.bincount(
+            self.card_color,
+            weights=self.players[self.current_player_idx]._hand_vec,
+            minlength=len(COLORS),
+        )
+        return int(color_counts[:BLACK_ID].argmax())
+
+    def _draw_cards(self, num_cards: int) -> np.ndarray:
+        """抽牌，返回抽到的牌的 unique_id（牌堆缓冲区的视图，需立即使用）"""
+        if self.deck_top < num_cards:
             self._replenish_deck()
-        for _ in range(num_cards):
-            if len(self.deck) > 0:
-                cards.append(self.deck.pop())
-        return cards
+        num_cards = min(num_cards, self.deck_top)
+        card_ids = self._deck_buf[self.deck_top - num_cards : self.deck_top]
+        self.deck_top -= num_cards
+        return card_ids
+
+    def _deal(self, player: "Player", num_cards: int):
+        """从牌堆抽 num_cards 张牌加入玩家手牌"""
+        player.add_cards([self.all_cards[i] for i in self._draw_cards(num_cards)])
 
     def _get_observation(self) -> dict:
-        """获取观察状态"""
+        """获取观察状态
+
+        hand 和 discard_pile 直接返回内部缓冲区而不复制：同一局内它们会被之后的 step
+        原地更新，需要保存某一步的观察时请 copy；reset 会换用新的缓冲区，
+        因此上一局（包括终局时）返回的观察在 reset 之后保持不变。
+        """
         return {
-            "hand": [
-                card.unique_id for card in self.players[self.current_player_idx].hand
-            ],
-            "current_color": self.current_color.value if self.current_color else None,
+            "hand": self.players[self.current_player_idx]._hand_vec,
+            "current_color": self._current_color_id,
             "direction": 1 if self.direction == 1 else 0,
             "player_turn": self.current_player_idx,
-            "discard_pile": [card.unique_id for card in self.discard_pile],
-            "deck_size": len(self.deck),
+            "discard_pile": self._discard_vec,
+            "deck_size": self.deck_top,
         }
 
+    def rollout(
+        self, num_games: int, max_steps: int = 10000, seed: Optional[int] = None
+    ):
+        """批量随机策略自我对局（uno_core 的纯数组实现，安装 numba 时编译执行）
+
+        返回 (winners, lengths)：每局胜者的玩家下标（超过 max_steps 未结束为 -1）和步数
+        """
+        from uno_core import rollout_random_games
+
+        if seed is None:
+            seed = int(self.np_random.integers(2**31))
+        return rollout_random_games(
+            num_games,
+            self.num_players,
+            max_steps,
+            seed,
+            self.card_color,
+            self.card_value_id,
+            self.card_type,
+        )
+
     def render(self, show_all=True):
         if len(self.players) == 0:
             raise ValueError("Game has not been initialized. Call `reset()` first.")
@@ -300,9 +458,34 @@ class UNOGame(Env):
 
 class Player:
     def __init__(self):
-        self.hand: List[Card] = []
+        # 手牌：unique_id -> Card，保持摸牌顺序
+        self.hand: Dict[int, Card] = {}
+        # 与 hand 同步的位掩码，第 unique_id 位为 1 表示持有该牌
+        self.hand_mask = 0
+        # 手牌的 MultiBinary 观察向量
+        self._hand_vec = np.zeros(108, dtype=np.uint8)
+        self.skip = False
+
+    def clear(self):
+        """清空手牌和状态（手牌观察向量换用新数组，不改写之前返回的观察）"""
+        self.hand.clear()
+        self.hand_mask = 0
+        self._hand_vec = np.zeros(108, dtype=np.uint8)
         self.skip = False
 
+    def add_cards(self, cards: List[Card]):
+        """将牌加入手牌"""
+        for card in cards:
+            self.hand[card.unique_id] = card
+            self.hand_mask |= 1 << card.unique_id
+            self._hand_vec[card.unique_id] = 1
+
+    def remove_card(self, card: Card):
+        """从手牌中移除一张牌"""
+        del self.hand[card.unique_id]
+        self.hand_mask &= ~(1 << card.unique_id)
+        self._hand_vec[card.unique_id] = 0
+
 
 # --------------------------
 # 渲染器
@@ -314,3 +497,7 @@ class UNORenderer(ABC):
 
     def user_input(self, env: UNOGame, valid_actions: list) -> int:
         raise NotImplementedError("User input not implemented")
+
+    def invalidate(self):
+        """通知渲染器画面需要整体重绘（如游戏重置时）"""
+        pass